@@ -0,0 +1,52 @@
+# Copyright 2021 Google LLC
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import contextlib
+import os
+
+
+# Opens a binary file that atomically replaces the file at the given path once
+# it has been completely written.
+#
+# Where possible, the data is written to an anonymous O_TMPFILE file, which is
+# only linked into the directory once complete. Nothing is left behind if the
+# program fails or gets killed midway. Otherwise, the data is written to a
+# temporary "~" file which is removed on failure.
+@contextlib.contextmanager
+def AtomicWrite(path):
+    tmp = path + '~'
+    try:
+        fd = os.open(os.path.dirname(path), os.O_TMPFILE | os.O_RDWR, 0o644)
+    except (AttributeError, OSError):
+        # No O_TMPFILE support on this platform or file system.
+        try:
+            with open(tmp, 'wb') as f:
+                yield f
+            os.replace(tmp, path)
+        except:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+        return
+
+    with open(fd, 'wb') as f:
+        yield f
+        f.flush()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        # Passing a dir_fd makes os.link() call linkat() with AT_SYMLINK_FOLLOW,
+        # which is needed to link the file itself rather than its /proc symlink.
+        os.link(f'/proc/self/fd/{fd}', tmp, src_dir_fd=fd)
+        os.replace(tmp, path)
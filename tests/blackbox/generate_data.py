@@ -15,87 +15,145 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from zipfile import ZipFile, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+from concurrent.futures import ProcessPoolExecutor
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA
+from zlib import crc32
 import os.path
+import time
 
 dir = os.path.dirname(os.path.realpath(__file__))
 
 
+# Adds the given (name, data) pairs as stored entries to the ZipFile z.
+# The pairs can come from any iterable, including a generator.
+# The result is the same as calling z.writestr(name, data) for each pair, but
+# each local header is written once with its final CRC and sizes, instead of
+# being written, patched and rewritten by ZipFile.open() for every entry.
+# All the entries get the given date_time, which defaults to the current time.
+#
+# This relies on CPython zipfile internals: like ZipFile.writestr(), it writes
+# the entries at z.start_dir, the end of the last entry, and then updates
+# z.filelist, z.NameToInfo, z.start_dir and z._didModify so that ZipFile.close()
+# writes the matching central directory. Unlike writestr(), it doesn't check
+# for duplicate names or for the ZIP64 limits.
+def WriteStoredFiles(z, files, date_time=None):
+    if date_time is None:
+        date_time = time.localtime(time.time())[:6]
+    fp = z.fp
+    fp.seek(z.start_dir)
+    for name, data in files:
+        zinfo = ZipInfo(name, date_time)
+        if name.endswith('/'):
+            zinfo.external_attr = 0o40775 << 16 | 0x10
+        else:
+            zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = zinfo.compress_size = len(data)
+        zinfo.CRC = crc32(data)
+        zinfo.header_offset = fp.tell()
+        fp.write(zinfo.FileHeader(False))
+        fp.write(data)
+        z.filelist.append(zinfo)
+        z.NameToInfo[name] = zinfo
+    z.start_dir = fp.tell()
+    z._didModify = True
+
+
 def MakeZipWithManySmallFiles():
     with ZipFile(os.path.join(dir, 'data', '100000-files.zip'),
                  'w',
                  allowZip64=True) as z:
-        for i in range(100000):
-            z.writestr('%06d.txt' % i, 'This is file %06d.\n' % i)
+        WriteStoredFiles(z, (('%06d.txt' % i, b'This is file %06d.\n' % i)
+                             for i in range(100000)),
+                         date_time=(1980, 1, 1, 0, 0, 0))
 
 
-def MakeOtherZips():
+def MakeFileDirSameNameZip():
     with ZipFile(os.path.join(dir, 'data', 'file-dir-same-name.zip'),
                  'w') as z:
-        z.writestr('pet/cat', 'This is my first pet cat\n')
-        z.writestr('pet', 'This is my first pet\n')
-        z.writestr('pet/cat/fish', 'This is my first pet cat fish\n')
-        z.writestr('pet/cat/fish/', '')
-        z.writestr('pet/cat', 'This is my second pet cat\n')
-        z.writestr('pet', 'This is my second pet\n')
-        z.writestr('pet/cat/fish', 'This is my second pet cat fish\n')
+        z.writestr('pet/cat', b'This is my first pet cat\n')
+        z.writestr('pet', b'This is my first pet\n')
+        z.writestr('pet/cat/fish', b'This is my first pet cat fish\n')
+        z.writestr('pet/cat/fish/', b'')
+        z.writestr('pet/cat', b'This is my second pet cat\n')
+        z.writestr('pet', b'This is my second pet\n')
+        z.writestr('pet/cat/fish', b'This is my second pet cat fish\n')
+
 
+def MakeLzmaZip():
     with ZipFile(os.path.join(dir, 'data', 'lzma.zip'),
                  'w',
                  compression=ZIP_LZMA) as z:
-        z.writestr('lzma.txt', 'This file is compressed with LZMA.\n')
+        z.writestr('lzma.txt', b'This file is compressed with LZMA.\n')
 
+
+def MakeBzip2Zip():
     with ZipFile(os.path.join(dir, 'data', 'bzip2.zip'),
                  'w',
                  compression=ZIP_BZIP2) as z:
-        z.writestr('bzip2.txt', 'This file is compressed with BZIP2.\n')
+        z.writestr('bzip2.txt', b'This file is compressed with BZIP2.\n')
+
 
+def MakeEmptyZip():
     with ZipFile(os.path.join(dir, 'data', 'empty.zip'), 'w') as z:
         pass
 
+
+def MakeMixedPathsZip():
     with ZipFile(os.path.join(dir, 'data', 'mixed-paths.zip'), 'w') as z:
         z.writestr('normal.txt',
-                   'This file is in the default "current" directory.\n')
-        z.writestr('../up-1.txt', 'This file is one level "up".\n')
-        z.writestr('../../up-2.txt', 'This file is two levels "up".\n')
-        z.writestr('/top.txt', 'This file is in the top root directory.\n')
+                   b'This file is in the default "current" directory.\n')
+        z.writestr('../up-1.txt', b'This file is one level "up".\n')
+        z.writestr('../../up-2.txt', b'This file is two levels "up".\n')
+        z.writestr('/top.txt', b'This file is in the top root directory.\n')
         z.writestr('/../over-the-top.txt',
-                   'This file is "above" the top root directory.\n')
-        z.writestr('.', 'This should not be a valid path.\n')
-        z.writestr('/.', 'This should not be a valid path.\n')
-        z.writestr('a/.', 'This should not be a valid path.\n')
-        z.writestr('a/./', 'This should not be a valid path.\n')
-        z.writestr('a/./b', 'This should not be a valid path.\n')
-        z.writestr('a/..', 'This should not be a valid path.\n')
-        z.writestr('a/../', 'This should not be a valid path.\n')
-        z.writestr('a/../b', 'This should not be a valid path.\n')
-        z.writestr('Star (*).txt', 'This is a star *.\n')
-        z.writestr('Question (?).txt', 'This is a question mark ?.\n')
-        z.writestr('Quote (\').txt', 'This is a quote \'.\n')
-        z.writestr('Double quote (\").txt', 'This is a double quote \".\n')
-        z.writestr('Backslash (\\).txt', 'This is a backslash \\.\n')
-        z.writestr('Angle <>.txt', 'These are angle brackets <>.\n')
-        z.writestr('Square [].txt', 'These are square brackets [].\n')
-        z.writestr('Empty/', 'This is an empty directory.\n')
-        z.writestr('/Empty/', 'This is an empty directory.\n')
+                   b'This file is "above" the top root directory.\n')
+        z.writestr('.', b'This should not be a valid path.\n')
+        z.writestr('/.', b'This should not be a valid path.\n')
+        z.writestr('a/.', b'This should not be a valid path.\n')
+        z.writestr('a/./', b'This should not be a valid path.\n')
+        z.writestr('a/./b', b'This should not be a valid path.\n')
+        z.writestr('a/..', b'This should not be a valid path.\n')
+        z.writestr('a/../', b'This should not be a valid path.\n')
+        z.writestr('a/../b', b'This should not be a valid path.\n')
+        z.writestr('Star (*).txt', b'This is a star *.\n')
+        z.writestr('Question (?).txt', b'This is a question mark ?.\n')
+        z.writestr('Quote (\').txt', b'This is a quote \'.\n')
+        z.writestr('Double quote (\").txt', b'This is a double quote \".\n')
+        z.writestr('Backslash (\\).txt', b'This is a backslash \\.\n')
+        z.writestr('Angle <>.txt', b'These are angle brackets <>.\n')
+        z.writestr('Square [].txt', b'These are square brackets [].\n')
+        z.writestr('Empty/', b'This is an empty directory.\n')
+        z.writestr('/Empty/', b'This is an empty directory.\n')
+
 
+def MakeLongNamesZip():
     with ZipFile(os.path.join(dir, 'data', 'long-names.zip'), 'w') as z:
-        z.writestr('Short name.txt', 'This is a short long name.\n')
+        z.writestr('Short name.txt', b'This is a short long name.\n')
         z.writestr('255 ' + 'z' * (255 - 8) + '.txt',
-                   'This file name has 255 characters.\n')
+                   b'This file name has 255 characters.\n')
         z.writestr('256 ' + 'z' * (256 - 8) + '.txt',
-                   'This file name has 256 characters.\n')
+                   b'This file name has 256 characters.\n')
         z.writestr('511 ' + 'z' * (511 - 8) + '.txt',
-                   'This file name has 511 characters.\n')
+                   b'This file name has 511 characters.\n')
         z.writestr('1023 ' + 'z' * (1023 - 9) + '.txt',
-                   'This file name has 1023 characters.\n')
+                   b'This file name has 1023 characters.\n')
         z.writestr('1024 ' + 'z' * (1024 - 9) + '.txt',
-                   'This file name has 1024 characters.\n')
+                   b'This file name has 1024 characters.\n')
         z.writestr('1025 ' + 'z' * (1025 - 9) + '.txt',
-                   'This file name has 1025 characters.\n')
+                   b'This file name has 1025 characters.\n')
         z.writestr(('a' * 255 + '/') * 16 + 'z' * 255,
-                   'This is a very long path.\n')
+                   b'This is a very long path.\n')
 
 
-MakeZipWithManySmallFiles()
-MakeOtherZips()
+if __name__ == '__main__':
+    # Each archive is independent of the others, so they are generated in
+    # parallel.
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(f) for f in [
+                MakeZipWithManySmallFiles, MakeFileDirSameNameZip, MakeLzmaZip,
+                MakeBzip2Zip, MakeEmptyZip, MakeMixedPathsZip, MakeLongNamesZip
+            ]
+        ]
+        for future in futures:
+            future.result()
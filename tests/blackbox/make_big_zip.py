@@ -16,23 +16,51 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from zipfile import ZipFile, ZIP_DEFLATED
+from atomic_write import AtomicWrite
 import os.path
 import os
+import sys
+import zipfile
+
+# Use the SIMD-accelerated ISA-L deflate and CRC-32 implementations if they are
+# available. They are drop-in replacements for the zlib ones.
+try:
+    from isal import isal_zlib
+    zipfile.zlib = isal_zlib
+    zipfile.crc32 = isal_zlib.crc32
+except ImportError:
+    pass
 
 dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
-tmp = os.path.join(dir, 'big.zip~')
 
-try:
-    with ZipFile(tmp, 'w', compression=ZIP_DEFLATED, allowZip64=True) as z:
+# Each line of big.txt starts with its 8-digit line number. Within a block of
+# 100000 lines, only the first three digits are shared, and everything after
+# them is the same from one block to the next. So the rest of each line is
+# formatted once, and each block is generated by a single join. Each block is
+# about 5 MB, which is big enough to keep the compressor busy, and small
+# enough to keep the memory usage low.
+lines = [
+    b'%05d The quick brown fox jumps over the lazy dog.\n' % j
+    for j in range(100000)
+]
+
+# Only show the progress on a terminal, where it gets overwritten in place.
+show_progress = sys.stdout.isatty()
+
+with AtomicWrite(os.path.join(dir, 'big.zip')) as out:
+    with ZipFile(out,
+                 'w',
+                 compression=ZIP_DEFLATED,
+                 compresslevel=1,
+                 allowZip64=True) as z:
         with z.open('big.txt', mode='w', force_zip64=True) as f:
-            for i in range(100):
-                print('\rWriting big.zip... %3d %%' % i, end='', flush=True)
-                for j in range(1000000):
-                    f.write(
-                        b'%02d%06d The quick brown fox jumps over the lazy dog.\n'
-                        % (i, j))
-
-    print('\r\033[2KDone', flush=True)
-    os.replace(tmp, os.path.join(dir, 'big.zip'))
-except:
-    os.remove(tmp)
+            for i in range(1000):
+                if show_progress and i % 10 == 0:
+                    print('\rWriting big.zip... %3d %%' % (i // 10),
+                          end='',
+                          flush=True)
+                prefix = b'%03d' % i
+                f.write(prefix)
+                f.write(prefix.join(lines))
+
+print('\r\033[2KDone' if show_progress else 'Done', flush=True)
@@ -15,32 +15,66 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+from atomic_write import AtomicWrite
 import os.path
 import os
+import sys
+import time
+import zlib
 
 dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
-tmp = os.path.join(dir, 'collisions.zip~')
-
-try:
-    with ZipFile(tmp, 'w', compression=ZIP_DEFLATED, allowZip64=True) as z:
-        z.writestr(
-            'a/b/c/d/e/f/g/h/i/j/There are many versions of this file (2)',
-            b'This should be two')
-        z.writestr(
-            'a/b/c/d/e/f/g/h/i/j/There are many versions of this file (4)',
-            b'This should be four')
-        for i in range(100):
-            print('\rWriting collisions.zip... %3d %%' % i, end='', flush=True)
-            for j in range(1000):
-                z.writestr(
-                    'a/b/c/d/e/f/g/h/i/j/There are many versions of this file',
-                    b'')
-        z.writestr(
-            'a/b/c/d/e/f/g/h/i/j/There are many versions of this file',
-            b'Last one')
-
-    print('\r\033[2KDone', flush=True)
-    os.replace(tmp, os.path.join(dir, 'collisions.zip'))
-except:
-    os.remove(tmp)
+name = 'a/b/c/d/e/f/g/h/i/j/There are many versions of this file'
+
+# Only show the progress on a terminal, where it gets overwritten in place.
+show_progress = sys.stdout.isatty()
+
+with AtomicWrite(os.path.join(dir, 'collisions.zip')) as out:
+    with ZipFile(out,
+                 'w',
+                 compression=ZIP_DEFLATED,
+                 compresslevel=1,
+                 allowZip64=True) as z:
+        z.writestr(name + ' (2)', b'This should be two')
+        z.writestr(name + ' (4)', b'This should be four')
+
+        if show_progress:
+            print('Writing collisions.zip...', end='', flush=True)
+
+        # Add 100000 empty entries with the same name. As with writestr(), they
+        # are deflated, and each holds the 2-byte empty deflate stream. Their
+        # local headers and data are all identical, so they are written in one
+        # go, and the ZipInfo objects only differ by their header offset.
+        # Building a fresh ZipInfo is about ten times cheaper than copy.copy()
+        # of a template.
+        #
+        # This relies on CPython zipfile internals: like ZipFile.writestr(), the
+        # entries are written at z.start_dir, and z.filelist, z.NameToInfo,
+        # z.start_dir and z._didModify are then updated so that
+        # ZipFile.close() writes the matching central directory.
+        date_time = time.localtime(time.time())[:6]
+        zinfo = ZipInfo(name, date_time)
+        zinfo.compress_type = ZIP_DEFLATED
+        zinfo.external_attr = 0o600 << 16
+        zinfo.CRC = 0
+        data = zlib.compressobj(1, zlib.DEFLATED, -15).flush()
+        zinfo.compress_size = len(data)
+        entry = zinfo.FileHeader(False) + data
+        z.fp.seek(z.start_dir)
+        start = z.start_dir
+        z.fp.write(entry * 100000)
+        for offset in range(start, z.fp.tell(), len(entry)):
+            zinfo = ZipInfo(name, date_time)
+            zinfo.compress_type = ZIP_DEFLATED
+            zinfo.external_attr = 0o600 << 16
+            zinfo.CRC = 0
+            zinfo.compress_size = len(data)
+            zinfo.header_offset = offset
+            z.filelist.append(zinfo)
+        z.NameToInfo[name] = zinfo
+        z.start_dir = z.fp.tell()
+        z._didModify = True
+
+        z.writestr(name, b'Last one')
+
+print('\r\033[2KDone' if show_progress else 'Done', flush=True)